@@ -1,93 +1,250 @@
+import argparse
+import json
 import os
 import subprocess
+import time
 import httpx
-import shutil
-from typing import Optional
 
+from git_setup import (
+    clean_git_artifacts,
+    create_gitignore,
+    create_readme,
+    git_ssh_env,
+    has_custom_ssh_command,
+    prewarm_ssh_connection,
+    run_git_steps,
+    wait_for_ssh_prewarm,
+)
+
+try:
+    import pygit2
+except ImportError:  # fall back to the git CLI
+    pygit2 = None
+
+GITHUB_API_URL = "https://api.github.com/user/repos"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+PROBE_CACHE_PATH = os.path.expanduser("~/.cache/github_repo_probe.json")
+PROBE_CACHE_TTL = 600  # seconds
+
+
+def load_probe_cache() -> dict:
+    """Load the ETag cache of previous repository probes"""
+    try:
+        with open(PROBE_CACHE_PATH, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def is_fresh_probe(entry) -> bool:
+    """Check that a cache entry is well-formed and younger than the TTL"""
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("etag"), str)
+        and isinstance(entry.get("exists"), bool)
+        and isinstance(entry.get("ts"), (int, float))
+        and time.time() - entry["ts"] <= PROBE_CACHE_TTL
+    )
+
+
+def save_probe_cache(cache: dict) -> None:
+    """Persist the ETag cache of repository probes"""
+    try:
+        os.makedirs(os.path.dirname(PROBE_CACHE_PATH), exist_ok=True)
+        with open(PROBE_CACHE_PATH, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"Could not write probe cache: {e}")
 
-def get_script_directory() -> str:
-    """Get the directory where the current script is located"""
-    return os.path.dirname(os.path.abspath(__file__))
 
+def check_github_repo_exists(client: httpx.Client, username: str, repo_name: str) -> bool:
+    """
+    Check if repository already exists on GitHub
 
-def clean_git_artifacts():
-    """Clean up git-related artifacts from failed attempts"""
-    if os.path.isdir(".git"):
-        print("Cleaning up existing .git directory...")
-        shutil.rmtree(".git")
+    Sends the cached ETag as If-None-Match so an unchanged repository answers
+    with a 304, which does not count against the rate limit.
+    """
+    url = f"https://api.github.com/repos/{username}/{repo_name}"
+    key = f"{username}/{repo_name}"
+    cache = load_probe_cache()
+    entry = cache.get(key)
+    if not is_fresh_probe(entry):
+        entry = None
+
+    # Only pass per-request headers when there is an ETag; auth lives on the client
+    headers = {"If-None-Match": entry["etag"]} if entry else None
+    response = client.get(url, headers=headers)
+    if response.status_code == 304 and entry:
+        return entry["exists"]
 
-    for item in os.listdir():
-        if item.startswith(".git"):
-            if os.path.isfile(item):
-                os.remove(item)
-                print(f"Removed {item}")
+    exists = response.status_code == 200
+    etag = response.headers.get("ETag")
+    if etag:
+        cache[key] = {"etag": etag, "exists": exists, "ts": time.time()}
+        save_probe_cache(cache)
+    return exists
 
 
-def create_gitignore(project_path: str) -> None:
+def check_repos_exist(client: httpx.Client, username: str, names: list[str]) -> dict[str, bool]:
     """
-    Create a .gitignore file from template
+    Check several candidate repository names with a single GraphQL request
 
     Args:
-        project_path: Path where .gitignore should be created
+        client: HTTP client carrying the auth headers
+        username: Owner of the repositories
+        names: Candidate repository names
+
+    Returns:
+        Mapping of each name to whether it already exists on GitHub
+    """
+    variables = {"owner": username}
+    fields = []
+    for i, name in enumerate(names):
+        variables[f"n{i}"] = name
+        fields.append(f"r{i}: repository(owner: $owner, name: $n{i}) {{ id }}")
+    params = "".join(f", $n{i}: String!" for i in range(len(names)))
+    query = f"query($owner: String!{params}) {{ {' '.join(fields)} }}"
+
+    response = client.post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables})
+    payload = response.json() if response.is_success else {}
+    errors = payload.get("errors") or []
+    if not response.is_success or any(error.get("type") != "NOT_FOUND" for error in errors):
+        # Fall back to one REST probe per name
+        return {name: check_github_repo_exists(client, username, name) for name in names}
+
+    data = payload.get("data") or {}
+    return {name: data.get(f"r{i}") is not None for i, name in enumerate(names)}
+
+
+def create_client(headers: dict) -> httpx.Client:
+    """Create the HTTP client shared by every GitHub API call of a run"""
+    # One pooled HTTP/2 connection serves the existence checks and the create calls
+    transport = httpx.HTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0),
+    )
+    return httpx.Client(
+        transport=transport,
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        headers=headers,
+    )
+
+
+def create_repo(client: httpx.Client, repo_name: str, repo_description: str) -> None:
+    """
+    Create the private repository on GitHub
 
     Raises:
-        FileNotFoundError: If template file is not found
+        httpx.HTTPError: If the request fails or GitHub rejects it
     """
-    script_dir = get_script_directory()
-    gitignore_template_path = os.path.join(script_dir, ".gitignore_template")
-    gitignore_path = os.path.join(project_path, ".gitignore")
-
-    # Check if .gitignore already exists
-    if os.path.exists(gitignore_path):
-        user_input = input(".gitignore already exists. Do you want to overwrite it? (y/n): ")
-        if user_input.lower() != 'y':
-            print("Keeping existing .gitignore file")
-            return
+    data = {
+        "name": repo_name,
+        "description": repo_description,
+        "private": True,
+    }
+    response = client.post(GITHUB_API_URL, json=data)
+    response.raise_for_status()
 
-    # Check if template exists
-    if not os.path.exists(gitignore_template_path):
-        raise FileNotFoundError(f".gitignore_template not found at {gitignore_template_path}")
 
-    # Create .gitignore from template
-    try:
-        with open(gitignore_template_path, "r") as template:
-            gitignore_content = template.read()
-        with open(gitignore_path, "w") as file:
-            file.write(gitignore_content)
-        print(f"Created .gitignore file at {gitignore_path}")
-    except IOError as e:
-        print(f"Error writing .gitignore file: {e}")
-        raise
-
-
-def check_github_repo_exists(client: httpx.Client, username: str, repo_name: str, headers: dict) -> bool:
-    """Check if repository already exists on GitHub"""
-    url = f"https://api.github.com/repos/{username}/{repo_name}"
-    response = client.get(url, headers=headers)
-    return response.status_code == 200
+def report_create_error(e: httpx.HTTPError) -> None:
+    """Print why a repository could not be created"""
+    print(f"Error creating repository: {e}")
+    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 422:
+        print("This might mean the repository already exists or the name is invalid.")
+
 
+def create_repos_from_file(client: httpx.Client, repos_file: str) -> bool:
+    """
+    Create every repository listed in a file, reusing one client
+
+    Each non-empty line holds a repository name, optionally followed by a
+    comma and its description. Lines starting with '#' are ignored.
 
-def setup_git_repository(repo_name: str, repo_description: str) -> None:
-    """Initialize git repository and create initial files"""
-    # Create README if it doesn't exist
-    readme_path = "README.md"
-    if not os.path.exists(readme_path):
-        print(f"Creating {readme_path}...")
-        with open(readme_path, "w") as f:
-            f.write(f"# {repo_name}\n\n{repo_description}")
+    Returns:
+        True if all repositories were created
+    """
+    with open(repos_file, "r") as f:
+        lines = [line.strip() for line in f]
+
+    ok = True
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        repo_name, _, repo_description = line.partition(",")
+        repo_name = repo_name.strip()
+        try:
+            create_repo(client, repo_name, repo_description.strip())
+            print(f"Repository '{repo_name}' created successfully on GitHub!")
+        except httpx.HTTPError as e:
+            report_create_error(e)
+            ok = False
+    return ok
 
-    # Initialize git repository
-    print("Initializing local Git repository...")
-    subprocess.run(["git", "init"], check=True)
 
-    # Create and switch to main branch
-    print("Creating and switching to 'main' branch...")
-    subprocess.run(["git", "checkout", "-b", "main"], check=True)
+def setup_git_repository_in_process(repo_name: str, repo_description: str, remote_url: str) -> None:
+    """
+    Initialize git repository, commit all files and add the remote with pygit2
+
+    Raises:
+        pygit2.GitError: If any repository operation fails
+        KeyError: If user.name or user.email is not configured
+    """
+    create_readme(repo_name, repo_description)
+
+    print("Initializing local Git repository on 'main'...")
+    repo = pygit2.init_repository(os.getcwd(), initial_head="main")
+
+    print("Adding files according to .gitignore rules...")
+    repo.index.add_all()
+    repo.index.write()
+    tree = repo.index.write_tree()
+    signature = repo.default_signature
+    repo.create_commit("HEAD", signature, signature, "Initial commit", tree, [])
+
+    repo.remotes.create("origin", remote_url)
+
+
+def prompt_repo_names() -> list[str]:
+    """Ask for the repository name, allowing comma-separated alternatives"""
+    while True:
+        names = input("Enter the name of the new GitHub repository (comma-separated alternatives allowed): ")
+        candidates = [name.strip() for name in names.split(",") if name.strip()]
+        if candidates:
+            return candidates
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line options; anything not given is prompted for"""
+    parser = argparse.ArgumentParser(
+        description="Create a private GitHub repository and push the current directory to it"
+    )
+    parser.add_argument("--username", help="GitHub username")
+    parser.add_argument("--name", help="name of the new repository")
+    parser.add_argument("--description", help="description of the new repository")
+    parser.add_argument(
+        "--overwrite-gitignore",
+        choices=["true", "false"],
+        help="replace an existing .gitignore without prompting",
+    )
+    parser.add_argument(
+        "--repos-file",
+        help="file with one 'name[,description]' per line; only creates the GitHub repositories",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report whether the repository names are already taken",
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+    overwrite_gitignore = None if args.overwrite_gitignore is None else args.overwrite_gitignore == "true"
+
     # Get GitHub credentials
-    github_username = input("Enter your GitHub username: ")
     github_token = os.getenv("GITHUB_TOKEN")
 
     if not github_token:
@@ -95,80 +252,103 @@ def main():
         exit(1)
 
     # Setup API request
-    github_api_url = "https://api.github.com/user/repos"
     headers = {
         "Authorization": f"token {github_token}",
         "Accept": "application/vnd.github.v3+json",
     }
 
-    # Create HTTP client
-    with httpx.Client() as client:
-        # Get repository details
-        while True:
-            repo_name = input("Enter the name of the new GitHub repository: ")
-            if check_github_repo_exists(client, github_username, repo_name, headers):
-                print(f"Repository '{repo_name}' already exists on GitHub!")
-                if input("Do you want to try a different name? (y/n): ").lower() != 'y':
-                    exit(1)
-                continue
-            break
+    with create_client(headers) as client:
+        if args.repos_file:
+            if not create_repos_from_file(client, args.repos_file):
+                exit(1)
+            return
 
-        repo_description = input("Enter a description for the repository: ")
+        # The username is only needed for the repository owner and remote URL
+        github_username = args.username or input("Enter your GitHub username: ")
 
-        # Clean up any existing git artifacts
-        clean_git_artifacts()
+        # Get repository details
+        if args.name:
+            candidates = [args.name]
+        else:
+            candidates = prompt_repo_names()
+
+        if args.dry_run:
+            existing = check_repos_exist(client, github_username, candidates)
+            for name in candidates:
+                state = "already exists" if existing[name] else "is available"
+                print(f"Repository '{name}' {state} on GitHub")
+            return
 
-        # Create repository on GitHub
-        data = {
-            "name": repo_name,
-            "description": repo_description,
-            "private": True,
-        }
+        if args.description is not None:
+            repo_description = args.description
+        else:
+            repo_description = input("Enter a description for the repository: ")
+
+        # Create repository on GitHub; a taken name comes back as 422, no probe needed
+        repo_name = None
+        while repo_name is None:
+            for name in candidates:
+                try:
+                    create_repo(client, name, repo_description)
+                except httpx.HTTPError as e:
+                    report_create_error(e)
+                    if not (isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 422):
+                        exit(1)
+                    continue
+                repo_name = name
+                print(f"Repository '{repo_name}' created successfully on GitHub!")
+                break
+            else:
+                if args.name or input("Do you want to try a different name? (y/n): ").lower() != 'y':
+                    exit(1)
+                candidates = prompt_repo_names()
 
-        try:
-            response = client.post(github_api_url, json=data, headers=headers)
-            response.raise_for_status()
-            print(f"Repository '{repo_name}' created successfully on GitHub!")
-        except httpx.HTTPError as e:
-            print(f"Error creating repository: {e}")
-            if response.status_code == 422:
-                print("This might mean the repository already exists or the name is invalid.")
-            exit(1)
+    # Start the SSH handshake for the final push while the local repository is set up,
+    # unless the user's own ssh setup decides how git connects
+    use_shared_ssh = not has_custom_ssh_command()
+    ssh_prewarm = prewarm_ssh_connection() if use_shared_ssh else None
+
+    # Clean up any existing git artifacts, only once the GitHub repository exists
+    clean_git_artifacts()
 
     # Create .gitignore
     project_path = os.getcwd()
     try:
-        create_gitignore(project_path)
+        create_gitignore(project_path, overwrite_gitignore)
     except Exception as e:
         print(f"Error creating .gitignore: {e}")
         exit(1)
 
     # Setup git repository
-    try:
-        setup_git_repository(repo_name, repo_description)
-    except subprocess.CalledProcessError as e:
-        print(f"Error setting up git repository: {e}")
-        exit(1)
-
-    # Add and commit files
-    try:
-        print("Adding files according to .gitignore rules...")
-        subprocess.run(["git", "add", "."], check=True)
-        subprocess.run(["git", "commit", "-m", "Initial commit"], check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Error during git add/commit: {e}")
-        exit(1)
-
-    # Setup remote and push
     remote_url = f"git@github.com:{github_username}/{repo_name}.git"
+    if pygit2 is not None:
+        try:
+            setup_git_repository_in_process(repo_name, repo_description, remote_url)
+        except (pygit2.GitError, KeyError) as e:
+            print(f"Error setting up git repository: {e}")
+            exit(1)
+        steps = []
+    else:
+        create_readme(repo_name, repo_description)
+        steps = [
+            ("Initializing local Git repository on 'main'...", ["git", "init", "-b", "main"]),
+            ("Adding files according to .gitignore rules...", ["git", "add", "."]),
+            (None, ["git", "commit", "-m", "Initial commit"]),
+            (None, ["git", "remote", "add", "origin", remote_url]),
+        ]
+
+    # Push to remote; kept out-of-process so the user's SSH agent setup is used as-is
+    steps.append((f"Pushing to remote repository: {remote_url}", ["git", "push", "-u", "origin", "main"]))
     try:
-        subprocess.run(["git", "remote", "add", "origin", remote_url], check=True)
-        print(f"Pushing to remote repository: {remote_url}")
-        subprocess.run(["git", "push", "-u", "origin", "main"], check=True)
+        wait_for_ssh_prewarm(ssh_prewarm)
+        run_git_steps(steps, env=git_ssh_env() if use_shared_ssh else None)
         print(f"Project successfully pushed to GitHub at {remote_url}")
     except subprocess.CalledProcessError as e:
-        print(f"Error pushing to GitHub: {e}")
-        print("This might be due to SSH key issues or network problems.")
+        if e.cmd[1] == "push":
+            print(f"Error pushing to GitHub: {e}")
+            print("This might be due to SSH key issues or network problems.")
+        else:
+            print(f"Error setting up git repository: {e}")
         exit(1)
 
 
@@ -1,67 +1,48 @@
+import argparse
+import atexit
 import os
 import subprocess
 import requests
-import shutil
-
-
-def get_script_directory():
-    """Get the directory where the current script is located"""
-    return os.path.dirname(os.path.abspath(__file__))
-
-
-def clean_git_artifacts():
-    """Clean up git-related artifacts from failed attempts"""
-    # Remove .git directory if it exists
-    if os.path.isdir(".git"):
-        print("Cleaning up existing .git directory...")
-        shutil.rmtree(".git")
-
-    # Remove any existing git config files
-    git_config = ".git*"
-    for item in os.listdir():
-        if item.startswith(".git"):
-            if os.path.isfile(item):
-                os.remove(item)
-                print(f"Removed {item}")
-
-
-def create_gitignore(project_path):
-    """Create .gitignore file first, before any git operations"""
-    # Get the directory where both scripts are located
-    script_dir = get_script_directory()
-    gitignore_script = os.path.join(script_dir, "create_gitignore.py")
-
-    # Check if create_gitignore.py exists
-    if not os.path.exists(gitignore_script):
-        raise FileNotFoundError(f"create_gitignore.py not found at {gitignore_script}")
-
-    # Check if .gitignore already exists
-    gitignore_path = os.path.join(project_path, ".gitignore")
-    if os.path.exists(gitignore_path):
-        user_input = input(".gitignore already exists. Do you want to overwrite it? (y/n): ")
-        if user_input.lower() != 'y':
-            print("Keeping existing .gitignore file")
-            return
-        print("Overwriting existing .gitignore file")
-
-    # Run create_gitignore.py with the correct path
-    try:
-        subprocess.run(["python", gitignore_script], check=True)
-        print("Created .gitignore using create_gitignore.py")
-    except subprocess.CalledProcessError as e:
-        print(f"Error creating .gitignore: {e}")
-        raise
-
-
-def check_github_repo_exists(repo_name, headers):
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from git_setup import (
+    clean_git_artifacts,
+    create_gitignore,
+    create_readme,
+    git_ssh_env,
+    has_custom_ssh_command,
+    prewarm_ssh_connection,
+    run_git_steps,
+    wait_for_ssh_prewarm,
+)
+
+def check_github_repo_exists(repo_name):
     """Check if repository already exists on GitHub"""
     url = f"https://api.github.com/repos/{GITHUB_USERNAME}/{repo_name}"
-    response = requests.get(url, headers=headers)
+    response = SESSION.get(url)
     return response.status_code == 200
 
 
+# Command line options; anything not given is prompted for
+parser = argparse.ArgumentParser(description="Create a public GitHub repository and push the current directory to it")
+parser.add_argument("--username", help="GitHub username")
+parser.add_argument("--name", help="name of the new repository")
+parser.add_argument("--description", help="description of the new repository")
+parser.add_argument(
+    "--overwrite-gitignore",
+    choices=["true", "false"],
+    help="replace an existing .gitignore without prompting",
+)
+parser.add_argument(
+    "--dry-run",
+    action="store_true",
+    help="only report whether the repository name is already taken",
+)
+args = parser.parse_args()
+
 # GitHub credentials
-GITHUB_USERNAME = input("Enter your GitHub username: ")
+GITHUB_USERNAME = args.username or input("Enter your GitHub username: ")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
 if not GITHUB_TOKEN:
@@ -77,94 +58,95 @@ headers = {
     "Accept": "application/vnd.github.v3+json",
 }
 
+# Shared session so both API calls reuse the same pooled connection
+SESSION = requests.Session()
+SESSION.headers.update(headers)
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    ),
+)
+atexit.register(SESSION.close)
+
 # Prompt user for the new repository name
-while True:
-    repo_name = input("Enter the name of the new GitHub repository: ")
-    if check_github_repo_exists(repo_name, headers):
-        print(f"Repository '{repo_name}' already exists on GitHub!")
-        continue_anyway = input("Do you want to try a different name? (y/n): ")
-        if continue_anyway.lower() == 'y':
-            continue
-        else:
-            exit(1)
-    break
+repo_name = args.name or input("Enter the name of the new GitHub repository: ")
 
-repo_description = input("Enter a description for the repository: ")
+if args.dry_run:
+    state = "already exists" if check_github_repo_exists(repo_name) else "is available"
+    print(f"Repository '{repo_name}' {state} on GitHub")
+    exit(0)
 
-# Clean up any existing git artifacts
-clean_git_artifacts()
+if args.description is not None:
+    repo_description = args.description
+else:
+    repo_description = input("Enter a description for the repository: ")
 
-# Payload to send to GitHub API for repository creation
-data = {
-    "name": repo_name,
-    "description": repo_description,
-    "private": False,  # Set to True if you want a private repo
-}
+# Use requests to make the API request; a taken name comes back as 422, no probe needed
+while True:
+    # Payload to send to GitHub API for repository creation
+    data = {
+        "name": repo_name,
+        "description": repo_description,
+        "private": False,  # Set to True if you want a private repo
+    }
 
-# Use requests to make the API request
-try:
-    response = requests.post(GITHUB_API_URL, json=data, headers=headers)
-    response.raise_for_status()
-    print(f"Repository '{repo_name}' created successfully on GitHub!")
-except requests.exceptions.RequestException as e:
-    print(f"Error creating repository: {e}")
-    if response.status_code == 422:
+    try:
+        response = SESSION.post(GITHUB_API_URL, json=data)
+        response.raise_for_status()
+        print(f"Repository '{repo_name}' created successfully on GitHub!")
+        break
+    except requests.exceptions.RequestException as e:
+        print(f"Error creating repository: {e}")
+        if e.response is None or e.response.status_code != 422:
+            exit(1)
         print("This might mean the repository already exists or the name is invalid.")
-    exit(1)
+        if args.name or input("Do you want to try a different name? (y/n): ").lower() != 'y':
+            exit(1)
+        repo_name = input("Enter the name of the new GitHub repository: ")
+
+# Start the SSH handshake for the final push while the local repository is set up,
+# unless the user's own ssh setup decides how git connects
+use_shared_ssh = not has_custom_ssh_command()
+ssh_prewarm = prewarm_ssh_connection() if use_shared_ssh else None
+
+# Clean up any existing git artifacts, only once the GitHub repository exists
+clean_git_artifacts()
 
 # Create .gitignore first
 project_path = os.getcwd()
 try:
-    create_gitignore(project_path)
+    overwrite_gitignore = None if args.overwrite_gitignore is None else args.overwrite_gitignore == "true"
+    create_gitignore(project_path, overwrite_gitignore)
 except Exception as e:
     print(f"Error during .gitignore creation: {e}")
     exit(1)
 
-# Initialize the local Git repository
-print("Initializing local Git repository...")
-try:
-    subprocess.run(["git", "init"], check=True)
-except subprocess.CalledProcessError as e:
-    print(f"Error initializing git repository: {e}")
-    exit(1)
-
 # Create a README file if none exists
-readme_path = "README.md"
-if not os.path.exists(readme_path):
-    print(f"Creating {readme_path}...")
-    with open(readme_path, "w") as f:
-        f.write(f"# {repo_name}\n\n{repo_description}")
-
-# Create and switch to main branch
-print("Creating and switching to 'main' branch...")
-try:
-    subprocess.run(["git", "checkout", "-b", "main"], check=True)
-except subprocess.CalledProcessError as e:
-    print(f"Error creating main branch: {e}")
-    exit(1)
+create_readme(repo_name, repo_description)
 
-# Add all files, commit, and push to GitHub
-print("Adding files according to .gitignore rules...")
-try:
-    subprocess.run(["git", "add", "."], check=True)
-    subprocess.run(["git", "commit", "-m", "Initial commit"], check=True)
-except subprocess.CalledProcessError as e:
-    print(f"Error during git add/commit: {e}")
-    exit(1)
-
-# Set the remote origin and push to GitHub
+# Initialize the local Git repository on main, commit everything and push to GitHub
+# in a single shell instead of one process per git command
 remote_url = f"git@github.com:{GITHUB_USERNAME}/{repo_name}.git"
+wait_for_ssh_prewarm(ssh_prewarm)
 try:
-    subprocess.run(["git", "remote", "add", "origin", remote_url], check=True)
-except subprocess.CalledProcessError as e:
-    print(f"Error adding remote: {e}")
-    exit(1)
-
-print(f"Pushing to remote repository: {remote_url}")
-try:
-    subprocess.run(["git", "push", "-u", "origin", "main"], check=True)
+    run_git_steps(
+        [
+            ("Initializing local Git repository on 'main'...", ["git", "init", "-b", "main"]),
+            ("Adding files according to .gitignore rules...", ["git", "add", "."]),
+            (None, ["git", "commit", "-m", "Initial commit"]),
+            (None, ["git", "remote", "add", "origin", remote_url]),
+            (f"Pushing to remote repository: {remote_url}", ["git", "push", "-u", "origin", "main"]),
+        ],
+        env=git_ssh_env() if use_shared_ssh else None,
+    )
     print(f"Project successfully pushed to GitHub at {remote_url}")
 except subprocess.CalledProcessError as e:
-    print(f"Error pushing to GitHub: {e}")
-    print("This might be due to SSH key issues or network problems.")
-    exit(1)
\ No newline at end of file
+    if e.cmd[1] == "push":
+        print(f"Error pushing to GitHub: {e}")
+        print("This might be due to SSH key issues or network problems.")
+    else:
+        print(f"Error setting up git repository: {e}")
+    exit(1)
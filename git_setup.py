@@ -0,0 +1,160 @@
+# Git and SSH helpers shared by the repo creation scripts
+import atexit
+import os
+import shlex
+import shutil
+import subprocess
+from typing import Optional
+
+from gitignore_template import TEMPLATE_BYTES
+
+# Let git push reuse the SSH connection opened while the repository is created
+SSH_CONTROL_OPTIONS = [
+    "-o", "ControlMaster=auto",
+    "-o", "ControlPath=~/.ssh/cm-%r@%h:%p",
+    "-o", "ControlPersist=60",
+]
+SSH_PREWARM_TIMEOUT = 15  # seconds
+
+
+def has_custom_ssh_command() -> bool:
+    """Check whether the user already configured how git runs ssh"""
+    if os.getenv("GIT_SSH_COMMAND") or os.getenv("GIT_SSH"):
+        return True
+    try:
+        result = subprocess.run(["git", "config", "--get", "core.sshCommand"], capture_output=True, text=True)
+    except OSError:
+        return False
+    return bool(result.stdout.strip())
+
+
+def prewarm_ssh_connection() -> Optional[subprocess.Popen]:
+    """
+    Open a shared SSH connection to github.com in the background for git push to reuse
+
+    The process is reaped at exit if the script stops before waiting for it.
+    """
+    try:
+        process = subprocess.Popen(
+            ["ssh", *SSH_CONTROL_OPTIONS, "-o", "BatchMode=yes", "-T", "git@github.com"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    atexit.register(stop_ssh_prewarm, process)
+    return process
+
+
+def stop_ssh_prewarm(process: subprocess.Popen) -> None:
+    """Kill the pre-warm connection if it is still running and reap it"""
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+def wait_for_ssh_prewarm(process: Optional[subprocess.Popen]) -> None:
+    """Let the pre-warm connection finish setting up the shared socket before pushing"""
+    if process is None:
+        return
+    try:
+        process.wait(timeout=SSH_PREWARM_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def git_ssh_env() -> dict:
+    """Environment for git commands that makes ssh use the shared connection"""
+    env = os.environ.copy()
+    env["GIT_SSH_COMMAND"] = shlex.join(["ssh", *SSH_CONTROL_OPTIONS])
+    return env
+
+
+def run_git_steps(steps: list[tuple[Optional[str], list[str]]], env: Optional[dict] = None) -> None:
+    """
+    Run git commands in order, stopping at the first failure
+
+    Args:
+        steps: (progress message or None, git command) pairs; each message is
+            printed right before its command runs
+
+    Raises:
+        subprocess.CalledProcessError: Carrying the failing command and git's exit status
+    """
+    for message, command in steps:
+        if message:
+            print(message)
+        subprocess.run(command, check=True, env=env)
+
+
+def clean_git_artifacts():
+    """Clean up git-related artifacts from failed attempts"""
+    if os.path.isdir(".git"):
+        print("Cleaning up existing .git directory...")
+        shutil.rmtree(".git")
+
+    with os.scandir(".") as entries:
+        for entry in entries:
+            # .gitignore is the user's file; create_gitignore decides whether to replace it
+            if entry.name == ".gitignore":
+                continue
+            if entry.name.startswith(".git") and entry.is_file(follow_symlinks=False):
+                os.unlink(entry.path)
+                print(f"Removed {entry.name}")
+
+
+def create_gitignore(project_path: str, overwrite: Optional[bool] = None) -> None:
+    """
+    Create a .gitignore file from the bundled template
+
+    Args:
+        project_path: Path where .gitignore should be created
+        overwrite: Whether to replace an existing .gitignore; prompts when None
+    """
+    gitignore_path = os.path.join(project_path, ".gitignore")
+    tmp_path = gitignore_path + ".tmp"
+
+    try:
+        # O_EXCL creates the file and detects an existing one in a single call
+        try:
+            fd = os.open(gitignore_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            write_path = gitignore_path
+        except FileExistsError:
+            if overwrite is None:
+                overwrite = input(".gitignore already exists. Do you want to overwrite it? (y/n): ").lower() == 'y'
+            if not overwrite:
+                print("Keeping existing .gitignore file")
+                return
+            # Write beside the existing file and swap it in atomically
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            write_path = tmp_path
+
+        try:
+            try:
+                os.write(fd, TEMPLATE_BYTES)
+            finally:
+                os.close(fd)
+            if write_path == tmp_path:
+                os.replace(tmp_path, gitignore_path)
+        except OSError:
+            # Don't leave a half-written .gitignore or a stray .gitignore.tmp behind
+            try:
+                os.unlink(write_path)
+            except OSError:
+                pass
+            raise
+        print(f"Created .gitignore file at {gitignore_path}")
+    except IOError as e:
+        print(f"Error writing .gitignore file: {e}")
+        raise
+
+
+def create_readme(repo_name: str, repo_description: str) -> None:
+    """Create README if it doesn't exist"""
+    readme_path = "README.md"
+    if not os.path.exists(readme_path):
+        print(f"Creating {readme_path}...")
+        with open(readme_path, "w") as f:
+            f.write(f"# {repo_name}\n\n{repo_description}")